@@ -5,6 +5,7 @@ import logging
 import click
 
 from azphotosync.config import ConfigError, load_config
+from azphotosync.promote import PromotionRunner
 from azphotosync.syncer import SyncRunner
 
 
@@ -15,7 +16,15 @@ from azphotosync.syncer import SyncRunner
 @click.option("--container", help="Blob container name")
 @click.option("--prefix", default="photos", show_default=True, help="Prefix for uploaded blobs")
 @click.option("--dry-run", is_flag=True, help="Scan and plan uploads without writing to Azure")
-@click.option("--max-workers", default=4, show_default=True, help="Concurrent hashing/upload workers")
+@click.option(
+    "--max-workers",
+    default=4,
+    show_default=True,
+    help=(
+        "Concurrent hashing workers and upper bound for adaptive upload concurrency. "
+        "Each upload uses one connection; raise this (e.g. 16) for libraries of large videos"
+    ),
+)
 @click.option(
     "--access-tier",
     default="cool",
@@ -23,8 +32,31 @@ from azphotosync.syncer import SyncRunner
     type=click.Choice(["hot", "cool", "cold", "archive"], case_sensitive=False),
     help="Azure blob access tier. cool is lowest-cost for infrequent access with acceptable download speed",
 )
+@click.option(
+    "--promote-mobile",
+    is_flag=True,
+    help="After syncing, hash and server-side copy iOS uploads into the content-addressed layout",
+)
+@click.option(
+    "--mobile-prefix",
+    default="mobile-import",
+    show_default=True,
+    help="Prefix the iOS app uploads under",
+)
 @click.option("--verbose", is_flag=True, help="Enable debug logs")
-def main(source_dir, state_dir, account_url, container, prefix, dry_run, max_workers, access_tier, verbose):
+def main(
+    source_dir,
+    state_dir,
+    account_url,
+    container,
+    prefix,
+    dry_run,
+    max_workers,
+    access_tier,
+    promote_mobile,
+    mobile_prefix,
+    verbose,
+):
     """Sync local photo/video assets into Azure Blob Storage safely and incrementally."""
     logging.basicConfig(
         level=logging.DEBUG if verbose else logging.INFO,
@@ -41,6 +73,8 @@ def main(source_dir, state_dir, account_url, container, prefix, dry_run, max_wor
             dry_run=dry_run,
             max_workers=max_workers,
             access_tier=access_tier,
+            promote_mobile=promote_mobile,
+            mobile_prefix=mobile_prefix,
         )
     except ConfigError as exc:
         raise click.ClickException(str(exc)) from exc
@@ -50,6 +84,13 @@ def main(source_dir, state_dir, account_url, container, prefix, dry_run, max_wor
         f"scan={stats.scanned} uploaded={stats.uploaded} skipped={stats.skipped} failed={stats.failed}"
     )
 
+    if config.promote_mobile:
+        promo = PromotionRunner(config).run()
+        click.echo(
+            f"mobile scan={promo.scanned} promoted={promo.promoted} deduplicated={promo.deduplicated} "
+            f"skipped={promo.skipped} failed={promo.failed}"
+        )
+
 
 if __name__ == "__main__":
     main()
@@ -15,6 +15,8 @@ class SyncConfig:
     dry_run: bool = False
     max_workers: int = 4
     access_tier: str = "cool"
+    promote_mobile: bool = False
+    mobile_prefix: str = "mobile-import"
 
     @property
     def db_path(self) -> Path:
@@ -34,6 +36,8 @@ def load_config(
     dry_run: bool,
     max_workers: int,
     access_tier: str,
+    promote_mobile: bool = False,
+    mobile_prefix: str = "mobile-import",
 ) -> SyncConfig:
     source = Path(source_dir).expanduser().resolve()
     state = Path(state_dir).expanduser().resolve()
@@ -59,6 +63,9 @@ def load_config(
     resolved_access_tier = access_tier.lower()
     if resolved_access_tier not in {"hot", "cool", "cold", "archive"}:
         raise ConfigError("--access-tier must be one of: hot, cool, cold, archive")
+    resolved_mobile_prefix = mobile_prefix.strip("/")
+    if promote_mobile and not resolved_mobile_prefix:
+        raise ConfigError("--mobile-prefix is required with --promote-mobile")
 
     return SyncConfig(
         source_dir=source,
@@ -69,4 +76,6 @@ def load_config(
         dry_run=dry_run,
         max_workers=max_workers,
         access_tier=resolved_access_tier,
+        promote_mobile=promote_mobile,
+        mobile_prefix=resolved_mobile_prefix,
     )
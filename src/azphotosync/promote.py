@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from azphotosync.config import SyncConfig
+from azphotosync.scanner import RemoteBlob, stream_sha256
+from azphotosync.state import FileRecord, SyncState
+from azphotosync.throttle import AdaptiveConcurrency, RetryBudget, RetryingExecutor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromotionStats:
+    scanned: int = 0
+    promoted: int = 0
+    deduplicated: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class MobilePromoter:
+    """Moves blobs uploaded by the iOS app into the content-addressed layout.
+
+    Each new blob under ``mobile_prefix`` is streamed through SHA-256 on a
+    worker, then either linked to an already indexed blob with the same hash or
+    server-side copied to ``<prefix>/<sha[0:2]>/<sha>/<user>/<path>``. Index
+    reads and writes stay on the calling thread.
+    """
+
+    def __init__(
+        self,
+        store,
+        state: SyncState,
+        prefix: str,
+        mobile_prefix: str = "mobile-import",
+        max_workers: int = 4,
+        dry_run: bool = False,
+        download_executor: RetryingExecutor | None = None,
+        copy_executor: RetryingExecutor | None = None,
+    ) -> None:
+        self._store = store
+        self._state = state
+        self._prefix = prefix.strip("/")
+        self._mobile_prefix = mobile_prefix.strip("/")
+        self._max_workers = max_workers
+        self._dry_run = dry_run
+        # Downloads and server-side copies differ in latency by orders of magnitude,
+        # so each phase gets its own limiter; the retry budget is shared.
+        budget = RetryBudget()
+        self._downloads = download_executor or RetryingExecutor(
+            AdaptiveConcurrency(initial=max_workers, maximum=max_workers),
+            budget,
+        )
+        self._copies = copy_executor or RetryingExecutor(
+            AdaptiveConcurrency(initial=max_workers, maximum=max_workers),
+            budget,
+        )
+
+    def run(self) -> PromotionStats:
+        stats = PromotionStats()
+        # Hashes being copied in this batch -> blobs with the same content waiting on that copy.
+        followers: dict[str, list[RemoteBlob]] = {}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            pending = {}
+            for blob in self._store.list_blobs(self._mobile_prefix):
+                stats.scanned += 1
+                record = self._state.get_by_path(blob.name)
+                if record and record.file_size == blob.size and record.mtime_ns == blob.mtime_ns:
+                    stats.skipped += 1
+                    continue
+                # Blobs whose copy failed on an earlier run keep their hash, so they are not downloaded again.
+                sha = self._state.get_remote_sha(blob.name, blob.size, blob.mtime_ns)
+                if sha:
+                    self._route(blob, sha, stats, followers, pending, pool)
+                else:
+                    pending[pool.submit(self._hash_blob, blob)] = (blob, None, None)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    blob, sha, dest_name = pending.pop(fut)
+                    if sha is None:
+                        sha = fut.result()
+                        if sha is None:
+                            stats.failed += 1
+                            continue
+                        if not self._dry_run:
+                            self._state.put_remote_sha(blob.name, blob.size, blob.mtime_ns, sha)
+                        self._route(blob, sha, stats, followers, pending, pool)
+                        continue
+
+                    etag = fut.result()
+                    waiting = followers.pop(sha)
+                    if etag is None:
+                        stats.failed += 1 + len(waiting)
+                        continue
+                    self._record(blob, sha, dest_name, etag)
+                    stats.promoted += 1
+                    for follower in waiting:
+                        self._record(follower, sha, dest_name, etag)
+                        stats.deduplicated += 1
+
+        return stats
+
+    def _route(self, blob, sha, stats, followers, pending, pool) -> None:
+        existing = self._state.get_by_sha(sha)
+        if existing:
+            self._record(blob, sha, existing.blob_name, existing.etag)
+            stats.deduplicated += 1
+        elif sha in followers:
+            followers[sha].append(blob)
+        else:
+            followers[sha] = []
+            dest_name = self._dest_name(blob, sha)
+            pending[pool.submit(self._copy_blob, blob, dest_name)] = (blob, sha, dest_name)
+
+    def _hash_blob(self, blob: RemoteBlob) -> str | None:
+        return self._downloads.call(
+            lambda: stream_sha256(self._store.iter_blob_chunks(blob.name)),
+            nbytes=blob.size,
+            label=f"hash {blob.name}",
+        )
+
+    def _copy_blob(self, blob: RemoteBlob, dest_name: str) -> str | None:
+        if self._dry_run:
+            logger.info("[DRY RUN] would promote %s -> %s", blob.name, dest_name)
+            return "dry-run"
+        return self._copies.call(
+            lambda: self._store.copy_blob(blob.name, dest_name, blob.size),
+            nbytes=blob.size,
+            label=f"copy {blob.name}",
+        )
+
+    def _dest_name(self, blob: RemoteBlob, sha: str) -> str:
+        rel_path = blob.name[len(self._mobile_prefix) + 1 :]
+        return f"{self._prefix}/{sha[:2]}/{sha}/{rel_path}"
+
+    def _record(self, blob: RemoteBlob, sha: str, blob_name: str, etag: str | None) -> None:
+        if self._dry_run:
+            return
+        self._state.upsert(
+            FileRecord(
+                local_path=blob.name,
+                file_size=blob.size,
+                mtime_ns=blob.mtime_ns,
+                sha256=sha,
+                blob_name=blob_name,
+                etag=etag,
+            )
+        )
+        logger.info("Promoted %s -> %s", blob.name, blob_name)
+
+
+class PromotionRunner:
+    def __init__(self, config: SyncConfig):
+        self._config = config
+
+    def run(self) -> PromotionStats:
+        from azphotosync.storage import AzureBlobStore
+
+        store = AzureBlobStore(
+            self._config.account_url,
+            self._config.container,
+            access_tier=self._config.access_tier,
+        )
+        with SyncState(self._config.db_path) as state:
+            return MobilePromoter(
+                store,
+                state,
+                prefix=self._config.prefix,
+                mobile_prefix=self._config.mobile_prefix,
+                max_workers=self._config.max_workers,
+                dry_run=self._config.dry_run,
+            ).run()
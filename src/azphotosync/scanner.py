@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -31,6 +32,13 @@ class LocalAsset:
     mtime_ns: int
 
 
+@dataclass(frozen=True)
+class RemoteBlob:
+    name: str
+    size: int
+    mtime_ns: int
+
+
 def iter_assets(source_dir: Path):
     for path in source_dir.rglob("*"):
         if not path.is_file():
@@ -52,3 +60,10 @@ def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
         while chunk := f.read(chunk_size):
             h.update(chunk)
     return h.hexdigest()
+
+
+def stream_sha256(chunks: Iterable[bytes]) -> str:
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
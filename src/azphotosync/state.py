@@ -18,6 +18,13 @@ CREATE TABLE IF NOT EXISTS file_index (
 );
 
 CREATE INDEX IF NOT EXISTS idx_file_index_sha ON file_index (sha256);
+
+CREATE TABLE IF NOT EXISTS remote_hashes (
+    blob_name TEXT PRIMARY KEY,
+    file_size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
 """
 
 
@@ -52,6 +59,22 @@ class SyncState:
             return None
         return FileRecord(*row)
 
+    def get_by_sha(self, sha256: str) -> FileRecord | None:
+        cur = self._conn.execute(
+            """
+            SELECT local_path, file_size, mtime_ns, sha256, blob_name, etag
+            FROM file_index
+            WHERE sha256 = ?
+            ORDER BY id
+            LIMIT 1
+            """,
+            (sha256,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        return FileRecord(*row)
+
     def upsert(self, record: FileRecord) -> None:
         self._conn.execute(
             """
@@ -76,6 +99,34 @@ class SyncState:
         )
         self._conn.commit()
 
+    def get_remote_sha(self, blob_name: str, file_size: int, mtime_ns: int) -> str | None:
+        cur = self._conn.execute(
+            """
+            SELECT sha256
+            FROM remote_hashes
+            WHERE blob_name = ? AND file_size = ? AND mtime_ns = ?
+            """,
+            (blob_name, file_size, mtime_ns),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        return row[0]
+
+    def put_remote_sha(self, blob_name: str, file_size: int, mtime_ns: int, sha256: str) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO remote_hashes (blob_name, file_size, mtime_ns, sha256)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(blob_name) DO UPDATE SET
+                file_size = excluded.file_size,
+                mtime_ns = excluded.mtime_ns,
+                sha256 = excluded.sha256
+            """,
+            (blob_name, file_size, mtime_ns, sha256),
+        )
+        self._conn.commit()
+
     def close(self) -> None:
         self._conn.close()
 
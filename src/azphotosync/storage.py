@@ -1,17 +1,58 @@
 from __future__ import annotations
 
 import mimetypes
+from collections.abc import Iterator
 from pathlib import Path
 
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient, ContentSettings
+from azure.storage.blob import (
+    BlobBlock,
+    BlobServiceClient,
+    ContentSettings,
+    ExponentialRetry,
+    StandardBlobTier,
+)
+
+from azphotosync.scanner import RemoteBlob
+from azphotosync.throttle import THROTTLE_STATUS
+
+_STORAGE_SCOPE = "https://storage.azure.com/.default"
+# Put Blob From URL rejects larger sources; those are copied block by block instead.
+_PUT_FROM_URL_MAX_BYTES = 5000 * 1024 * 1024
+_COPY_BLOCK_BYTES = 100 * 1024 * 1024
+
+
+class _DeferThrottlingRetry(ExponentialRetry):
+    """The SDK's default retries, except 429/503 on calls made with ``defer_throttling=True``.
+
+    Those calls are wrapped by ``RetryingExecutor``, which needs to see throttling
+    straight away to honour ``Retry-After`` and shrink concurrency. Everything
+    else, including the blocks and ranges of other transfers, keeps the SDK's
+    retries.
+    """
+
+    def configure_retries(self, request):
+        settings = super().configure_retries(request)
+        settings["defer_throttling"] = request.context.options.pop("defer_throttling", False)
+        return settings
+
+    def increment(self, settings, request, response=None, error=None):
+        if settings["defer_throttling"] and response is not None and response.status_code in THROTTLE_STATUS:
+            return False
+        return super().increment(settings, request, response=response, error=error)
 
 
 class AzureBlobStore:
     def __init__(self, account_url: str, container_name: str, access_tier: str = "cool"):
         self._access_tier = access_tier
         self._credential = DefaultAzureCredential(exclude_interactive_browser_credential=True)
-        self._service = BlobServiceClient(account_url=account_url, credential=self._credential)
+        self._service = BlobServiceClient(
+            account_url=account_url,
+            credential=self._credential,
+            retry_policy=_DeferThrottlingRetry(),
+        )
         self._container = self._service.get_container_client(container_name)
 
     def ensure_container(self) -> None:
@@ -25,8 +66,66 @@ class AzureBlobStore:
             resp = blob.upload_blob(
                 fd,
                 overwrite=False,
-                max_concurrency=4,
-                standard_blob_tier=self._access_tier.capitalize(),
+                max_concurrency=1,  # parallelism comes from AdaptiveConcurrency slots
+                standard_blob_tier=self._blob_tier(),
                 content_settings=ContentSettings(content_type=content_type),
+                defer_throttling=True,
             )
         return resp["etag"]
+
+    def list_blobs(self, prefix: str) -> Iterator[RemoteBlob]:
+        for props in self._container.list_blobs(name_starts_with=f"{prefix.strip('/')}/"):
+            yield RemoteBlob(
+                name=props.name,
+                size=props.size,
+                mtime_ns=int(props.last_modified.timestamp() * 1_000_000_000),
+            )
+
+    def iter_blob_chunks(self, blob_name: str) -> Iterator[bytes]:
+        return self._container.get_blob_client(blob_name).download_blob(defer_throttling=True).chunks()
+
+    def copy_blob(self, source_name: str, dest_name: str, size: int) -> str:
+        """Server-side copy within the container; no bytes pass through this host."""
+        source = self._container.get_blob_client(source_name)
+        dest = self._container.get_blob_client(dest_name)
+        if size > _PUT_FROM_URL_MAX_BYTES:
+            return self._copy_in_blocks(source, dest, size)
+        resp = dest.upload_blob_from_url(
+            source.url,
+            overwrite=False,
+            source_authorization=self._source_authorization(),
+            standard_blob_tier=self._blob_tier(),
+            defer_throttling=True,
+        )
+        return resp["etag"]
+
+    def _copy_in_blocks(self, source, dest, size: int) -> str:
+        if dest.exists():
+            raise ResourceExistsError(f"Blob already exists: {dest.blob_name}")
+        blocks = []
+        for index, offset in enumerate(range(0, size, _COPY_BLOCK_BYTES)):
+            block_id = f"{index:06d}"
+            dest.stage_block_from_url(
+                block_id,
+                source.url,
+                source_offset=offset,
+                source_length=min(_COPY_BLOCK_BYTES, size - offset),
+                source_authorization=self._source_authorization(),
+                defer_throttling=True,
+            )
+            blocks.append(BlobBlock(block_id=block_id))
+        resp = dest.commit_block_list(
+            blocks,
+            content_settings=source.get_blob_properties().content_settings,
+            standard_blob_tier=self._blob_tier(),
+            match_condition=MatchConditions.IfMissing,
+            defer_throttling=True,
+        )
+        return resp["etag"]
+
+    def _blob_tier(self) -> StandardBlobTier:
+        # The SDK reads ``.value`` off the tier, so a plain str fails at request time.
+        return StandardBlobTier(self._access_tier.capitalize())
+
+    def _source_authorization(self) -> str:
+        return f"Bearer {self._credential.get_token(_STORAGE_SCOPE).token}"
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import logging
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
 from azphotosync.config import SyncConfig
 from azphotosync.scanner import file_sha256, iter_assets
 from azphotosync.state import FileRecord, SyncState
+from azphotosync.throttle import AdaptiveConcurrency, RetryBudget, RetryingExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,15 @@ class SyncStats:
 class SyncRunner:
     def __init__(self, config: SyncConfig):
         self._config = config
+        # Start at max_workers and let the limiter shrink on throttling or congestion.
+        # Each upload is a single connection, so max_workers caps connections too.
+        self._uploads = RetryingExecutor(
+            AdaptiveConcurrency(
+                initial=config.max_workers,
+                maximum=config.max_workers,
+            ),
+            RetryBudget(),
+        )
 
     def run(self) -> SyncStats:
         from azphotosync.storage import AzureBlobStore
@@ -73,7 +82,7 @@ class SyncRunner:
             logger.info("[DRY RUN] would upload %s -> %s", rel_path, blob_name)
             return True
 
-        etag = self._upload_with_retry(store, path, blob_name)
+        etag = self._upload_with_retry(store, path, blob_name, size)
         if etag is None:
             return False
 
@@ -90,21 +99,9 @@ class SyncRunner:
         logger.info("Uploaded %s", rel_path)
         return True
 
-    def _upload_with_retry(self, store, path, blob_name, retries: int = 3) -> str | None:
-        delay = 1.0
-        for attempt in range(1, retries + 1):
-            try:
-                return store.upload_file(path, blob_name)
-            except Exception as exc:  # Azure SDK may not be installed in local dev env.
-                name = exc.__class__.__name__
-                if name == "ResourceExistsError":
-                    logger.info("Blob already exists %s", blob_name)
-                    return "existing"
-                transient = {"ServiceRequestError", "ServiceResponseError", "AzureError"}
-                if name in transient and attempt < retries:
-                    logger.warning("Transient upload error (%s/%s): %s", attempt, retries, exc)
-                    time.sleep(delay)
-                    delay *= 2
-                    continue
-                logger.error("Failed upload %s: %s", blob_name, exc)
-                return None
+    def _upload_with_retry(self, store, path, blob_name, size) -> str | None:
+        return self._uploads.call(
+            lambda: store.upload_file(path, blob_name),
+            nbytes=size,
+            label=f"upload {blob_name}",
+        )
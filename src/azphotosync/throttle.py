@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUS = {429, 503}
+THROTTLE_CODES = {"ServerBusy"}
+TRANSIENT_STATUS = {408, 500, 502, 504}
+TRANSIENT_ERRORS = {"ServiceRequestError", "ServiceResponseError", "AzureError"}
+
+
+@dataclass(frozen=True)
+class ErrorVerdict:
+    kind: str  # one of: exists, throttled, transient, fatal
+    retry_after: float | None = None
+
+
+def classify_error(exc: BaseException) -> ErrorVerdict:
+    """Map an Azure SDK (or look-alike) exception to a retry decision.
+
+    Matches on ``status_code``/``error_code`` where present and falls back to
+    class names so the SDK does not have to be importable.
+    """
+    name = exc.__class__.__name__
+    status = getattr(exc, "status_code", None)
+    code = getattr(exc, "error_code", None)
+    code = getattr(code, "value", code)
+
+    if name == "ResourceExistsError" or code == "BlobAlreadyExists":
+        return ErrorVerdict("exists")
+    if status in THROTTLE_STATUS or code in THROTTLE_CODES:
+        return ErrorVerdict("throttled", _retry_after_seconds(exc))
+    if status in TRANSIENT_STATUS or name in TRANSIENT_ERRORS:
+        return ErrorVerdict("transient", _retry_after_seconds(exc))
+    return ErrorVerdict("fatal")
+
+
+def _retry_after_seconds(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+
+    for key in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = lowered.get(key)
+        if value:
+            try:
+                return max(0.0, float(value) / 1000)
+            except ValueError:
+                pass
+
+    value = lowered.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Retry tokens shared by all workers.
+
+    Every success deposits ``ratio`` tokens and every retry spends one, so a
+    store that is failing across the board cannot be hammered by retries from
+    each worker independently. Throttled attempts that carry ``Retry-After``
+    are paced by the server instead and do not spend tokens.
+    """
+
+    def __init__(self, ratio: float = 0.2, initial: float = 10.0, max_tokens: float = 100.0) -> None:
+        self._ratio = ratio
+        self._tokens = min(initial, max_tokens)
+        self._max_tokens = max_tokens
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class AdaptiveConcurrency:
+    """AIMD limiter for in-flight uploads.
+
+    The limit grows by one after each window of ``limit`` successes while
+    throughput holds and latency stays within ``latency_tolerance`` of the best
+    observed, and is cut by ``decrease_factor`` on throttling, latency
+    inflation or a throughput drop.
+
+    Latency is measured per byte, with each request charged
+    ``request_overhead_bytes`` for its fixed cost, so a window holding a large
+    video is not mistaken for congestion.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        throughput_drop: float = 0.8,
+        cooldown: float = 1.0,
+        request_overhead_bytes: int = 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if minimum < 1 or maximum < minimum:
+            raise ValueError("concurrency bounds must satisfy 1 <= minimum <= maximum")
+        self._minimum = minimum
+        self._maximum = maximum
+        self._limit = min(max(initial, minimum), maximum)
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+        self._throughput_drop = throughput_drop
+        self._cooldown = cooldown
+        self._request_overhead_bytes = request_overhead_bytes
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._baseline_latency: float | None = None
+        self._last_throughput: float | None = None
+        self._reset_window()
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        with self._cond:
+            return self._in_flight
+
+    def acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self._paused_until - self._clock()
+                if wait <= 0 and self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self, latency: float, nbytes: int) -> None:
+        with self._cond:
+            self._window_count += 1
+            self._window_bytes += nbytes + self._request_overhead_bytes
+            self._window_latency += latency
+            if self._window_count < self._limit:
+                return
+
+            now = self._clock()
+            # Seconds per byte, and the aggregate bytes/s that ``limit`` slots sustain at that rate.
+            byte_latency = self._window_latency / self._window_bytes
+            throughput = self._limit / byte_latency if byte_latency > 0 else None
+
+            baseline = self._baseline_latency
+            if baseline is None or byte_latency < baseline:
+                self._baseline_latency = byte_latency
+            else:
+                # Drift slowly so a permanently slower link is not read as congestion forever.
+                self._baseline_latency = baseline + (byte_latency - baseline) * 0.05
+
+            inflated = baseline is not None and byte_latency > baseline * self._latency_tolerance
+            dropped = (
+                throughput is not None
+                and self._last_throughput is not None
+                and throughput < self._last_throughput * self._throughput_drop
+            )
+            if inflated or dropped:
+                self._decrease(now, "latency" if inflated else "throughput")
+            else:
+                if throughput is not None:
+                    self._last_throughput = throughput
+                if self._limit < self._maximum:
+                    self._limit += 1
+                    self._cond.notify_all()
+            self._reset_window()
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        with self._cond:
+            now = self._clock()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if now - self._last_decrease >= self._cooldown:
+                self._decrease(now, "throttled")
+                self._reset_window()
+
+    def _decrease(self, now: float, reason: str) -> None:
+        new_limit = max(self._minimum, int(self._limit * self._decrease_factor))
+        if new_limit != self._limit:
+            logger.info("Upload concurrency %s -> %s (%s)", self._limit, new_limit, reason)
+        self._limit = new_limit
+        self._last_decrease = now
+        # Throughput at the old limit is not a fair yardstick for the new one.
+        self._last_throughput = None
+
+    def _reset_window(self) -> None:
+        self._window_count = 0
+        self._window_bytes = 0
+        self._window_latency = 0.0
+
+
+class RetryingExecutor:
+    """Runs blob operations under an :class:`AdaptiveConcurrency` slot with shared retries."""
+
+    def __init__(
+        self,
+        concurrency: AdaptiveConcurrency,
+        budget: RetryBudget | None = None,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        rng: random.Random | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.concurrency = concurrency
+        self.budget = budget or RetryBudget()
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._rng = rng or random.Random()
+        self._rng_lock = threading.Lock()
+        self._sleep = sleep
+        self._clock = clock
+
+    def call(self, operation: Callable[[], str], nbytes: int, label: str) -> str | None:
+        """Return the operation's etag, ``"existing"`` if the blob exists, or ``None`` on failure."""
+        for attempt in range(1, self._max_attempts + 1):
+            with self.concurrency.slot():
+                started = self._clock()
+                try:
+                    result = operation()
+                except Exception as exc:  # Azure SDK may not be installed in local dev env.
+                    error = exc
+                    verdict = classify_error(exc)
+                else:
+                    self.concurrency.record_success(self._clock() - started, nbytes)
+                    self.budget.record_success()
+                    return result
+
+            if verdict.kind == "exists":
+                logger.info("Blob already exists %s", label)
+                return "existing"
+            if verdict.kind == "throttled":
+                self.concurrency.record_throttle(verdict.retry_after)
+            if verdict.kind == "fatal" or attempt == self._max_attempts:
+                logger.error("Failed %s: %s", label, error)
+                return None
+            # The server said when to come back; waiting that out costs it nothing, so only
+            # retries we schedule ourselves draw on the shared budget.
+            paced = verdict.kind == "throttled" and verdict.retry_after is not None
+            if not paced and not self.budget.try_spend():
+                logger.error("Retry budget exhausted, giving up on %s: %s", label, error)
+                return None
+
+            delay = self._backoff(attempt, verdict.retry_after)
+            logger.warning(
+                "%s error on %s (%s/%s), retrying in %.2fs: %s",
+                verdict.kind.capitalize(),
+                label,
+                attempt,
+                self._max_attempts,
+                delay,
+                error,
+            )
+            self._sleep(delay)
+        return None
+
+    def _backoff(self, attempt: int, retry_after: float | None) -> float:
+        cap = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        with self._rng_lock:
+            delay = self._rng.uniform(0, cap)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._max_delay))
+        return delay
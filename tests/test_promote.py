@@ -0,0 +1,235 @@
+import hashlib
+import threading
+import time
+
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+
+from azphotosync.promote import MobilePromoter
+from azphotosync.scanner import RemoteBlob
+from azphotosync.state import FileRecord, SyncState
+from azphotosync.throttle import AdaptiveConcurrency, RetryingExecutor
+
+
+def server_busy():
+    exc = HttpResponseError(message="busy")
+    exc.status_code = 503
+    exc.error_code = "ServerBusy"
+    return exc
+
+
+class FakeBlobStore:
+    def __init__(self, blobs, copy_delay=0.0, fail_copies=False, throttle_downloads=False):
+        self.blobs = {name: (data, 1_000) for name, data in blobs.items()}
+        self.copy_delay = copy_delay
+        self.fail_copies = fail_copies
+        self.throttle_downloads = throttle_downloads
+        self.throttled = set()
+        self.copies = []
+        self.downloads = 0
+        self.active_copies = 0
+        self.max_active_copies = 0
+        self.lock = threading.Lock()
+
+    def list_blobs(self, prefix):
+        for name, (data, mtime_ns) in sorted(self.blobs.items()):
+            if name.startswith(f"{prefix}/"):
+                yield RemoteBlob(name=name, size=len(data), mtime_ns=mtime_ns)
+
+    def iter_blob_chunks(self, blob_name):
+        with self.lock:
+            self.downloads += 1
+            if self.throttle_downloads and blob_name not in self.throttled:
+                self.throttled.add(blob_name)
+                raise server_busy()
+        data = self.blobs[blob_name][0]
+        for i in range(0, len(data), 4):
+            yield data[i : i + 4]
+
+    def copy_blob(self, source_name, dest_name, size):
+        if self.fail_copies:
+            raise PermissionError("denied")
+        with self.lock:
+            if dest_name in self.blobs:
+                raise ResourceExistsError(dest_name)
+            self.active_copies += 1
+            self.max_active_copies = max(self.max_active_copies, self.active_copies)
+        try:
+            time.sleep(self.copy_delay)
+            with self.lock:
+                self.blobs[dest_name] = self.blobs[source_name]
+                self.copies.append((source_name, dest_name))
+            return f"etag-{dest_name}"
+        finally:
+            with self.lock:
+                self.active_copies -= 1
+
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_promotes_new_mobile_blobs_into_sha_layout(tmp_path):
+    store = FakeBlobStore(
+        {
+            "mobile-import/ios-user/2024/05/01/101010-a.jpg": b"first photo",
+            "mobile-import/ios-user/2024/05/01/101011-b.mov": b"second clip",
+            "photos/other/blob.jpg": b"not mobile",
+        }
+    )
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos").run()
+
+        digest = sha(b"first photo")
+        record = state.get_by_path("mobile-import/ios-user/2024/05/01/101010-a.jpg")
+        assert record is not None
+        assert record.sha256 == digest
+        assert record.blob_name == f"photos/{digest[:2]}/{digest}/ios-user/2024/05/01/101010-a.jpg"
+        assert record.blob_name in store.blobs
+
+        again = MobilePromoter(store, state, prefix="photos").run()
+
+    assert (stats.scanned, stats.promoted, stats.failed) == (2, 2, 0)
+    assert (again.scanned, again.skipped, again.promoted) == (2, 2, 0)
+    assert len(store.copies) == 2
+
+
+def test_skips_copy_when_content_already_indexed(tmp_path):
+    data = b"already synced from a folder"
+    digest = sha(data)
+    store = FakeBlobStore({"mobile-import/ios-user/2024/05/01/101010-a.jpg": data})
+    with SyncState(tmp_path / "index.db") as state:
+        state.upsert(
+            FileRecord(
+                local_path="camera/a.jpg",
+                file_size=len(data),
+                mtime_ns=1,
+                sha256=digest,
+                blob_name=f"photos/{digest[:2]}/{digest}/camera/a.jpg",
+                etag="e1",
+            )
+        )
+        stats = MobilePromoter(store, state, prefix="photos").run()
+        record = state.get_by_path("mobile-import/ios-user/2024/05/01/101010-a.jpg")
+
+    assert stats.deduplicated == 1
+    assert store.copies == []
+    assert record.blob_name == f"photos/{digest[:2]}/{digest}/camera/a.jpg"
+
+
+def test_duplicates_within_a_batch_are_copied_once(tmp_path):
+    store = FakeBlobStore(
+        {
+            "mobile-import/phone-a/2024/05/01/101010-a.jpg": b"same bytes",
+            "mobile-import/phone-b/2024/05/02/090000-a.jpg": b"same bytes",
+        },
+        copy_delay=0.01,
+    )
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos").run()
+        first = state.get_by_path("mobile-import/phone-a/2024/05/01/101010-a.jpg")
+        second = state.get_by_path("mobile-import/phone-b/2024/05/02/090000-a.jpg")
+
+    assert (stats.promoted, stats.deduplicated) == (1, 1)
+    assert len(store.copies) == 1
+    assert first.blob_name == second.blob_name
+
+
+def test_failed_copy_leaves_blobs_unindexed(tmp_path):
+    store = FakeBlobStore(
+        {
+            "mobile-import/ios-user/2024/05/01/101010-a.jpg": b"x",
+            "mobile-import/ios-user/2024/05/01/101011-a.jpg": b"x",
+        },
+        fail_copies=True,
+    )
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos").run()
+        assert state.get_by_path("mobile-import/ios-user/2024/05/01/101010-a.jpg") is None
+
+    assert stats.failed == 2
+
+
+def test_rerun_after_failed_copy_reuses_cached_hash(tmp_path):
+    name = "mobile-import/ios-user/2024/05/01/101010-a.mov"
+    store = FakeBlobStore({name: b"a very long 4K recording"}, fail_copies=True)
+    with SyncState(tmp_path / "index.db") as state:
+        first = MobilePromoter(store, state, prefix="photos").run()
+        store.fail_copies = False
+        second = MobilePromoter(store, state, prefix="photos").run()
+        assert state.get_by_path(name).sha256 == sha(b"a very long 4K recording")
+
+    assert (first.failed, second.promoted) == (1, 1)
+    assert store.downloads == 1
+
+
+def test_existing_destination_counts_as_promoted(tmp_path):
+    data = b"copied before a crash"
+    digest = sha(data)
+    name = "mobile-import/ios-user/2024/05/01/101010-a.jpg"
+    store = FakeBlobStore({name: data})
+    store.blobs[f"photos/{digest[:2]}/{digest}/ios-user/2024/05/01/101010-a.jpg"] = (data, 1_000)
+
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos").run()
+        assert state.get_by_path(name).etag == "existing"
+
+    assert stats.promoted == 1
+
+
+def test_runs_promotions_concurrently(tmp_path):
+    store = FakeBlobStore(
+        {f"mobile-import/ios-user/2024/05/01/1010{i:02d}-a.jpg": f"photo {i}".encode() for i in range(12)},
+        copy_delay=0.02,
+    )
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos", max_workers=8).run()
+
+    assert stats.promoted == 12
+    assert store.max_active_copies > 1
+
+
+def test_dry_run_hashes_without_copying_or_indexing(tmp_path):
+    name = "mobile-import/ios-user/2024/05/01/101010-a.jpg"
+    store = FakeBlobStore({name: b"data"})
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(store, state, prefix="photos", dry_run=True).run()
+        assert state.get_by_path(name) is None
+
+    assert stats.promoted == 1
+    assert store.downloads == 1
+    assert store.copies == []
+
+
+class TrackingConcurrency(AdaptiveConcurrency):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lowest = self.limit
+
+    def record_throttle(self, retry_after=None):
+        super().record_throttle(retry_after)
+        self.lowest = min(self.lowest, self.limit)
+
+
+def test_throttled_downloads_do_not_shrink_copy_concurrency(tmp_path):
+    store = FakeBlobStore(
+        {f"mobile-import/ios-user/2024/05/01/1010{i:02d}-a.jpg": f"photo {i}".encode() for i in range(6)},
+        throttle_downloads=True,
+    )
+    downloads = RetryingExecutor(TrackingConcurrency(initial=4, maximum=4, cooldown=0.0), sleep=lambda _: None)
+    copies = RetryingExecutor(TrackingConcurrency(initial=4, maximum=4, cooldown=0.0), sleep=lambda _: None)
+
+    with SyncState(tmp_path / "index.db") as state:
+        stats = MobilePromoter(
+            store,
+            state,
+            prefix="photos",
+            max_workers=4,
+            download_executor=downloads,
+            copy_executor=copies,
+        ).run()
+
+    assert stats.promoted == 6
+    assert len(store.throttled) == 6
+    assert downloads.concurrency.lowest < 4
+    assert copies.concurrency.lowest == 4
+    assert copies.concurrency.limit == 4
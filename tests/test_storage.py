@@ -0,0 +1,250 @@
+import functools
+import io
+
+import pytest
+import requests
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.core.pipeline.transport import HttpTransport
+from azure.core.pipeline.transport._requests_basic import RequestsTransportResponse
+from azure.storage.blob import BlobServiceClient, StandardBlobTier
+from requests.structures import CaseInsensitiveDict
+
+from azphotosync import storage
+from azphotosync.promote import MobilePromoter
+from azphotosync.state import FileRecord, SyncState
+from azphotosync.storage import AzureBlobStore
+from azphotosync.throttle import classify_error
+
+SERVER_BUSY = (
+    503,
+    b'<?xml version="1.0" encoding="utf-8"?><Error><Code>ServerBusy</Code><Message>busy</Message></Error>',
+    {"x-ms-error-code": "ServerBusy", "Retry-After": "2", "Content-Type": "application/xml"},
+)
+LISTING = (
+    200,
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<EnumerationResults ServiceEndpoint="https://acct.blob.core.windows.net/" ContainerName="photos">'
+    b"<Blobs><Blob><Name>mobile-import/ios-user/2024/05/01/101010-a.jpg</Name><Properties>"
+    b"<Last-Modified>Wed, 01 May 2024 10:10:10 GMT</Last-Modified><Content-Length>5</Content-Length>"
+    b"<BlobType>BlockBlob</BlobType></Properties></Blob></Blobs><NextMarker /></EnumerationResults>",
+    {"Content-Type": "application/xml"},
+)
+
+
+class FakeToken:
+    token = "tok"
+
+
+class FakeCredential:
+    def get_token(self, scope):
+        return FakeToken()
+
+
+class FakeProperties:
+    content_settings = "video/quicktime"
+
+
+class FakeBlobClient:
+    def __init__(self, name, exists=False):
+        self.blob_name = name
+        self.url = f"https://acct.blob.core.windows.net/photos/{name}"
+        self._exists = exists
+        self.calls = []
+
+    def exists(self):
+        return self._exists
+
+    def get_blob_properties(self):
+        return FakeProperties()
+
+    # Explicit keyword-only parameters: anything the real SDK would leak to the transport is a TypeError here.
+    def upload_blob(
+        self, data, *, overwrite, max_concurrency, standard_blob_tier, content_settings, defer_throttling
+    ):
+        assert defer_throttling is True
+        assert isinstance(standard_blob_tier, StandardBlobTier)
+        self.calls.append(("upload", data.read()))
+        return {"etag": "uploaded"}
+
+    def upload_blob_from_url(
+        self, source_url, *, overwrite, source_authorization, standard_blob_tier, defer_throttling
+    ):
+        assert defer_throttling is True
+        assert isinstance(standard_blob_tier, StandardBlobTier)
+        self.calls.append(
+            (
+                "put_from_url",
+                source_url,
+                {
+                    "overwrite": overwrite,
+                    "source_authorization": source_authorization,
+                    "standard_blob_tier": standard_blob_tier,
+                },
+            )
+        )
+        return {"etag": "small"}
+
+    def stage_block_from_url(
+        self, block_id, source_url, *, source_offset, source_length, source_authorization, defer_throttling
+    ):
+        assert defer_throttling is True
+        self.calls.append(("stage", block_id, source_offset, source_length))
+
+    def commit_block_list(
+        self, blocks, *, content_settings, standard_blob_tier, match_condition, defer_throttling
+    ):
+        assert defer_throttling is True
+        assert isinstance(standard_blob_tier, StandardBlobTier)
+        self.calls.append(
+            (
+                "commit",
+                [b.id for b in blocks],
+                {
+                    "content_settings": content_settings,
+                    "standard_blob_tier": standard_blob_tier,
+                    "match_condition": match_condition,
+                },
+            )
+        )
+        return {"etag": "large"}
+
+
+class FakeContainer:
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def get_blob_client(self, name):
+        return self.blobs[name]
+
+
+def make_store(blobs):
+    store = AzureBlobStore.__new__(AzureBlobStore)
+    store._access_tier = "cool"
+    store._credential = FakeCredential()
+    store._container = FakeContainer(blobs)
+    return store
+
+
+def test_copy_blob_uses_put_blob_from_url_for_small_sources():
+    dest = FakeBlobClient("dest")
+    store = make_store({"src": FakeBlobClient("src"), "dest": dest})
+
+    assert store.copy_blob("src", "dest", 10) == "small"
+    kind, url, kwargs = dest.calls[0]
+    assert kind == "put_from_url"
+    assert url.endswith("/src")
+    assert kwargs["source_authorization"] == "Bearer tok"
+    assert kwargs["overwrite"] is False
+    assert kwargs["standard_blob_tier"] == StandardBlobTier.COOL
+
+
+def test_copy_blob_stages_blocks_above_put_from_url_limit(monkeypatch):
+    monkeypatch.setattr(storage, "_PUT_FROM_URL_MAX_BYTES", 100)
+    monkeypatch.setattr(storage, "_COPY_BLOCK_BYTES", 40)
+    dest = FakeBlobClient("dest")
+    store = make_store({"src": FakeBlobClient("src"), "dest": dest})
+
+    assert store.copy_blob("src", "dest", 101) == "large"
+    stages = [c for c in dest.calls if c[0] == "stage"]
+    assert [(offset, length) for _, _, offset, length in stages] == [(0, 40), (40, 40), (80, 21)]
+    kind, block_ids, kwargs = dest.calls[-1]
+    assert kind == "commit"
+    assert block_ids == ["000000", "000001", "000002"]
+    assert kwargs["content_settings"] == "video/quicktime"
+    assert kwargs["match_condition"] == MatchConditions.IfMissing
+
+
+def test_block_copy_refuses_existing_destination(monkeypatch):
+    monkeypatch.setattr(storage, "_PUT_FROM_URL_MAX_BYTES", 100)
+    dest = FakeBlobClient("dest", exists=True)
+    store = make_store({"src": FakeBlobClient("src"), "dest": dest})
+
+    with pytest.raises(ResourceExistsError):
+        store.copy_blob("src", "dest", 101)
+    assert dest.calls == []
+
+
+def test_upload_file_passes_tier_enum(tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"jpeg")
+    blob = FakeBlobClient("photos/a.jpg")
+    store = make_store({"photos/a.jpg": blob})
+
+    assert store.upload_file(photo, "photos/a.jpg") == "uploaded"
+    assert blob.calls == [("upload", b"jpeg")]
+
+
+class ScriptedTransport(HttpTransport):
+    """Replays canned responses; anything past the script is a 201."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, body, headers = self.script.pop(0) if self.script else (201, b"", {})
+        resp = requests.Response()
+        resp.status_code = status
+        resp.reason = "scripted"
+        resp._content = body
+        resp.raw = io.BytesIO(body)
+        resp.headers = CaseInsensitiveDict({"Content-Length": str(len(body)), **headers})
+        return RequestsTransportResponse(request, resp)
+
+
+def make_sdk_store(monkeypatch, transport):
+    monkeypatch.setattr(storage, "DefaultAzureCredential", lambda **kwargs: None)
+    # Skip the SDK's 15s+ backoff between retries.
+    monkeypatch.setattr(storage._DeferThrottlingRetry, "sleep", lambda self, settings, transport: None)
+    monkeypatch.setattr(storage, "BlobServiceClient", functools.partial(BlobServiceClient, transport=transport))
+    return AzureBlobStore("https://acct.blob.core.windows.net", "photos")
+
+
+def test_upload_surfaces_throttling_without_sdk_retries(monkeypatch, tmp_path):
+    photo = tmp_path / "a.jpg"
+    photo.write_bytes(b"jpeg")
+    transport = ScriptedTransport([SERVER_BUSY])
+    store = make_sdk_store(monkeypatch, transport)
+
+    with pytest.raises(HttpResponseError) as excinfo:
+        store.upload_file(photo, "photos/a.jpg")
+
+    assert len(transport.requests) == 1
+    verdict = classify_error(excinfo.value)
+    assert (verdict.kind, verdict.retry_after) == ("throttled", 2.0)
+
+
+def test_transient_error_during_listing_does_not_abort_promotion(monkeypatch, tmp_path):
+    transport = ScriptedTransport([SERVER_BUSY, LISTING])
+    store = make_sdk_store(monkeypatch, transport)
+    name = "mobile-import/ios-user/2024/05/01/101010-a.jpg"
+
+    with SyncState(tmp_path / "index.db") as state:
+        state.upsert(
+            FileRecord(
+                local_path=name,
+                file_size=5,
+                mtime_ns=1714558210 * 1_000_000_000,
+                sha256="abc",
+                blob_name="photos/ab/abc/ios-user/2024/05/01/101010-a.jpg",
+                etag="e1",
+            )
+        )
+        stats = MobilePromoter(store, state, prefix="photos").run()
+
+    assert len(transport.requests) == 2
+    assert (stats.scanned, stats.skipped, stats.failed) == (1, 1, 0)
@@ -0,0 +1,257 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from azure.core.exceptions import ResourceExistsError
+
+from azphotosync.throttle import (
+    AdaptiveConcurrency,
+    RetryBudget,
+    RetryingExecutor,
+    classify_error,
+)
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status_code, error_code=None, headers=None):
+        super().__init__(f"{status_code} {error_code}")
+        self.status_code = status_code
+        self.error_code = error_code
+        self.response = FakeResponse(headers or {})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CeilingStore:
+    """Store whose aggregate bandwidth saturates at ``slots`` concurrent uploads and throttles above ``busy_at``."""
+
+    def __init__(self, slots=8, busy_at=12, base_latency=1.0):
+        self.slots = slots
+        self.busy_at = busy_at
+        self.base_latency = base_latency
+
+    def wave(self, concurrency):
+        latency = self.base_latency * max(1.0, concurrency / self.slots)
+        throttled = max(0, concurrency - self.busy_at)
+        return latency, concurrency - throttled, throttled
+
+
+def test_classify_error_reads_status_code_and_retry_after():
+    busy = classify_error(FakeHttpError(503, "ServerBusy", {"Retry-After": "3"}))
+    assert busy.kind == "throttled"
+    assert busy.retry_after == 3.0
+
+    assert classify_error(FakeHttpError(429, headers={"x-ms-retry-after-ms": "250"})).retry_after == 0.25
+    assert classify_error(FakeHttpError(500)).kind == "transient"
+    assert classify_error(FakeHttpError(403, "AuthorizationFailure")).kind == "fatal"
+    assert classify_error(ResourceExistsError("exists")).kind == "exists"
+
+
+def test_adaptive_concurrency_settles_below_throughput_ceiling():
+    clock = FakeClock()
+    store = CeilingStore(slots=8, busy_at=12)
+    limiter = AdaptiveConcurrency(initial=2, maximum=32, cooldown=0.5, clock=clock)
+
+    history = []
+    for _ in range(200):
+        limit = limiter.limit
+        latency, ok, throttled = store.wave(limit)
+        clock.now += latency
+        for _ in range(throttled):
+            limiter.record_throttle()
+        for _ in range(ok):
+            limiter.record_success(latency, 1024)
+        history.append(limit)
+
+    steady = history[50:]
+    assert max(steady) <= store.busy_at + 1
+    assert min(steady) >= store.slots // 2
+    assert sum(steady) / len(steady) >= store.slots * 0.75
+
+
+def test_adaptive_concurrency_backs_off_on_latency_inflation():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial=4, maximum=32, clock=clock)
+
+    for latency in (1.0, 1.0):
+        clock.now += latency
+        for _ in range(limiter.limit):
+            limiter.record_success(latency, 1024)
+    grown = limiter.limit
+    assert grown == 6
+
+    clock.now += 5.0
+    for _ in range(limiter.limit):
+        limiter.record_success(5.0, 1024)
+    assert limiter.limit == grown // 2
+
+
+def test_adaptive_concurrency_ignores_large_files_at_steady_bandwidth():
+    mb = 1024 * 1024
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial=8, maximum=8, clock=clock)
+
+    for _ in range(5):
+        clock.now += 0.5
+        for _ in range(8):
+            limiter.record_success(0.5, 5 * mb)
+
+    clock.now += 50.0
+    for _ in range(7):
+        limiter.record_success(0.5, 5 * mb)
+    limiter.record_success(50.0, 500 * mb)
+    assert limiter.limit == 8
+
+    clock.now += 0.5
+    for _ in range(8):
+        limiter.record_success(0.5, 5 * mb)
+    assert limiter.limit == 8
+
+
+def test_retry_budget_is_shared_and_refilled_by_successes():
+    budget = RetryBudget(ratio=0.5, initial=1.0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_success()
+    budget.record_success()
+    assert budget.try_spend()
+
+
+def test_retrying_executor_honours_retry_after_and_shrinks_concurrency():
+    sleeps = []
+    limiter = AdaptiveConcurrency(initial=8, maximum=8, cooldown=0.0)
+    executor = RetryingExecutor(limiter, RetryBudget(), sleep=sleeps.append, rng=random.Random(0))
+    calls = iter([FakeHttpError(503, "ServerBusy", {"Retry-After": "0.01"}), "etag-1"])
+
+    def upload():
+        item = next(calls)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    assert executor.call(upload, nbytes=10, label="upload a") == "etag-1"
+    assert limiter.limit == 4
+    assert sleeps and sleeps[0] >= 0.01
+
+
+def test_retrying_executor_stops_when_budget_exhausted():
+    attempts = []
+    executor = RetryingExecutor(
+        AdaptiveConcurrency(initial=4, maximum=4, cooldown=0.0),
+        RetryBudget(initial=3.0),
+        max_attempts=10,
+        sleep=lambda _: None,
+    )
+
+    def upload():
+        attempts.append(1)
+        raise FakeHttpError(500, "InternalError")
+
+    results = [executor.call(upload, nbytes=10, label=f"upload {i}") for i in range(5)]
+    assert results == [None] * 5
+    assert len(attempts) == 5 + 3
+
+
+def test_retrying_executor_maps_existing_blob_and_fatal_errors():
+    executor = RetryingExecutor(AdaptiveConcurrency(initial=1), sleep=lambda _: None)
+
+    def exists():
+        raise ResourceExistsError("already there")
+
+    def forbidden():
+        raise FakeHttpError(403, "AuthorizationFailure")
+
+    assert executor.call(exists, nbytes=1, label="upload x") == "existing"
+    assert executor.call(forbidden, nbytes=1, label="upload y") is None
+
+
+def test_threaded_uploads_against_throttling_store():
+    class ThrottlingStore:
+        def __init__(self, busy_at):
+            self.busy_at = busy_at
+            self.active = 0
+            self.throttled = 0
+            self.lock = threading.Lock()
+
+        def upload_file(self, name):
+            with self.lock:
+                self.active += 1
+                busy = self.active > self.busy_at
+                if busy:
+                    self.throttled += 1
+            try:
+                if busy:
+                    raise FakeHttpError(503, "ServerBusy", {"Retry-After": "0.005"})
+                time.sleep(0.002)
+                return f"etag-{name}"
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+    store = ThrottlingStore(busy_at=3)
+    limiter = AdaptiveConcurrency(initial=16, maximum=16, cooldown=0.01)
+    executor = RetryingExecutor(limiter, RetryBudget(initial=50.0), max_attempts=10, base_delay=0.001)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(
+            pool.map(
+                lambda i: executor.call(lambda: store.upload_file(i), nbytes=100, label=f"upload {i}"),
+                range(60),
+            )
+        )
+
+    assert results == [f"etag-{i}" for i in range(60)]
+    assert store.throttled > 0
+    assert limiter.limit < 16
+    assert limiter.in_flight == 0
+
+
+def test_throttling_burst_at_startup_does_not_exhaust_retry_budget():
+    class BurstStore:
+        def __init__(self, burst_calls):
+            self.remaining = burst_calls
+            self.throttled = 0
+            self.lock = threading.Lock()
+
+        def upload_file(self, name):
+            with self.lock:
+                busy = self.remaining > 0
+                if busy:
+                    self.remaining -= 1
+                    self.throttled += 1
+            if busy:
+                raise FakeHttpError(503, "ServerBusy", {"Retry-After": "0.005"})
+            time.sleep(0.001)
+            return f"etag-{name}"
+
+    store = BurstStore(burst_calls=32)
+    budget = RetryBudget()
+    executor = RetryingExecutor(
+        AdaptiveConcurrency(initial=16, maximum=16, cooldown=0.01),
+        budget,
+        max_attempts=10,
+    )
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(
+            pool.map(
+                lambda i: executor.call(lambda: store.upload_file(i), nbytes=100, label=f"upload {i}"),
+                range(48),
+            )
+        )
+
+    assert results == [f"etag-{i}" for i in range(48)]
+    assert store.throttled == 32
+    assert budget.tokens >= 10.0